@@ -5,17 +5,83 @@ Windows CLI tool to monitor and submit jobs across multiple Linux servers
 """
 
 import paramiko
+import codecs
+import concurrent.futures
 import json
 import sys
 import os
+import shlex
 import time
 import shutil
+import socket
+import tarfile
+import threading
 import yaml
-from collections import OrderedDict
+from collections import namedtuple
 from getpass import getuser
 from pathlib import Path
 
 
+# orjson parses job listings much faster than the stdlib and accepts bytes
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+def _report_error(message, errors):
+    """Print message, or collect it in errors when a list is given"""
+    if errors is None:
+        print(message)
+    else:
+        errors.append(message)
+
+# Connection details for one configured server
+Server = namedtuple('Server', ['hostname', 'name', 'username', 'key_file', 'inotify_logs'])
+
+# Prefer the libyaml-backed loader; the pure-Python one is much slower
+try:
+    from yaml import CSafeLoader as _YAML_LOADER
+    _HAVE_LIBYAML = True
+except ImportError:
+    from yaml import SafeLoader as _YAML_LOADER
+    _HAVE_LIBYAML = False
+
+
+def _config_cache_path(path):
+    """Return the path of the parsed-config cache that sits next to path."""
+    return Path(f"{path}.cache")
+
+
+def _read_config_cache(path, mtime_ns):
+    """Return the cached config for path if it was written for mtime_ns, else None."""
+    try:
+        with open(_config_cache_path(path), 'r') as f:
+            if f.readline().strip() != f"# mtime: {mtime_ns}":
+                return None
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_config_cache(path, mtime_ns, config):
+    """Store config as JSON next to path so unchanged files skip YAML parsing."""
+    try:
+        data = json.dumps(config)
+        # Only cache configs that survive a JSON round trip unchanged
+        if json.loads(data) != config:
+            return
+        cache_path = _config_cache_path(path)
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            f.write(f"# mtime: {mtime_ns}\n")
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # Caching is best effort; a read-only directory must not break startup
+        pass
+
+
 def load_config(config_path=None):
     """
     Load configuration from YAML file.
@@ -32,25 +98,35 @@ def load_config(config_path=None):
     search_paths = []
     
     if config_path:
-        search_paths.append(config_path)
+        search_paths.append(str(config_path))
     else:
         # Current directory
-        search_paths.append(Path("./config.yaml"))
+        search_paths.append(os.path.join(".", "config.yaml"))
         # User's home directory
-        search_paths.append(Path.home() / ".pbs_monitor" / "config.yaml")
+        search_paths.append(os.path.join(os.path.expanduser("~"), ".pbs_monitor", "config.yaml"))
         # Script directory
-        search_paths.append(Path(__file__).parent / "config.yaml")
+        search_paths.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.yaml"))
     
+    # One stat per candidate; its mtime also keys the parsed-config cache
     for path in search_paths:
-        if Path(path).exists():
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        
+        config = _read_config_cache(path, st.st_mtime_ns)
+        if config is None:
+            if not _HAVE_LIBYAML:
+                print("⚠️  PyYAML has no libyaml support; install libyaml and reinstall PyYAML for faster config parsing")
             try:
                 with open(path, 'r') as f:
-                    config = yaml.safe_load(f)
-                print(f"✓ Loaded configuration from: {path}")
-                return config
+                    config = yaml.load(f, Loader=_YAML_LOADER)
             except yaml.YAMLError as e:
                 print(f"❌ Error parsing config file {path}: {e}")
                 sys.exit(1)
+            _write_config_cache(path, st.st_mtime_ns, config)
+        print(f"✓ Loaded configuration from: {path}")
+        return config
     
     print("❌ Configuration file not found!")
     print("   Searched in:")
@@ -123,6 +199,15 @@ class PBSJobManager:
         self.user = user
         self.all_jobs = []
         
+        # Sorted views of all_jobs keyed by sort field, reset on every fetch
+        self._sorted_cache = {}
+        
+        # Lookup indexes over all_jobs, rebuilt on every fetch
+        self._job_by_id = {}
+        self._job_by_prefix = {}
+        self.jobs_by_status = {}
+        self.jobs_by_owner = {}
+        
         # Extract PBS configuration values
         self.qdel_path = config['pbs']['qdel_path']
         self.qsub_path = config['pbs']['qsub_path']
@@ -137,19 +222,33 @@ class PBSJobManager:
         
         # SSH configuration
         self.ssh_timeout = config.get('ssh', {}).get('connection_timeout', 10)
+        self.ssh_keepalive = config.get('ssh', {}).get('keepalive_interval', 30)
         
         # Create reverse mapping: server hostname -> drive letter
         self.server_to_drive = {hostname: drive for drive, hostname in self.drive_mapping.items()}
         
         # Setup servers with username and key_file
         self.servers = self._setup_servers(config['servers'])
+        self.server_by_name = {s.name: s for s in self.servers}
+        self.server_by_host = {s.hostname: s for s in self.servers}
         
         # Calculate script paths
         self.script_dir = f"{self.linux_base_path}/{self.user}"
         self.script_path = f"{self.script_dir}/{self.remote_script_name}"
+        
+        # Persistent SSH clients keyed by hostname, reused across commands
+        self._ssh_pool = {}
+        self._ssh_pool_lock = threading.Lock()
+        
+        # Per-hostname cache of whether inotifywait is available remotely
+        self._has_inotify = {}
+        
+        # Long-running 'que.py --server-mode' helpers keyed by hostname as
+        # (channel, stdin, stdout); None marks servers without server mode
+        self._helper_channels = {}
     
     def _setup_servers(self, servers_config):
-        """Add username and key_file to server configurations."""
+        """Build Server entries with username and key_file from the configuration."""
         # Get user's home directory for SSH key
         user_home = os.path.expanduser("~")
         default_key_path = os.path.join(user_home, ".ssh", "id_rsa")
@@ -167,104 +266,306 @@ class PBSJobManager:
             use_key = None
             print(f"⚠️  No SSH key found. You may be prompted for passwords.")
         
-        servers = []
-        for srv in servers_config:
-            server = {
-                'hostname': srv['hostname'],
-                'name': srv['name'],
-                'username': self.user,
-                'key_file': use_key
-            }
-            servers.append(server)
-        
-        return servers
+        return [
+            Server(srv['hostname'], srv['name'], self.user, use_key, bool(srv.get('inotify_logs', False)))
+            for srv in servers_config
+        ]
     
-    def connect_and_execute(self, server, command):
-        """Execute command on remote server via SSH"""
-        try:
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            # Connect using SSH key or password
-            if 'key_file' in server and server['key_file']:
+    def _get_client(self, server):
+        """Return a connected SSH client for server, reusing a pooled one if alive"""
+        hostname = server.hostname
+        with self._ssh_pool_lock:
+            ssh = self._ssh_pool.get(hostname)
+        
+        transport = ssh.get_transport() if ssh else None
+        if transport is not None and transport.is_active():
+            return ssh
+        
+        # Connect outside the lock so different servers can handshake in parallel
+        ssh = paramiko.SSHClient()
+        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        
+        # Connect using SSH key or password
+        if server.key_file:
+            # Skip the agent and ~/.ssh scan when the key is already known
+            try:
                 ssh.connect(
-                    server['hostname'],
-                    username=server['username'],
-                    key_filename=server['key_file'],
-                    timeout=self.ssh_timeout
+                    hostname,
+                    username=server.username,
+                    key_filename=server.key_file,
+                    timeout=self.ssh_timeout,
+                    banner_timeout=self.ssh_timeout,
+                    auth_timeout=self.ssh_timeout,
+                    allow_agent=False,
+                    look_for_keys=False
                 )
-            else:
+            except (paramiko.PasswordRequiredException, paramiko.AuthenticationException):
+                # A passphrase-protected key may still be loaded in Pageant/ssh-agent
+                ssh.close()
+                ssh = paramiko.SSHClient()
+                ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
                 ssh.connect(
-                    server['hostname'],
-                    username=server['username'],
-                    timeout=self.ssh_timeout
+                    hostname,
+                    username=server.username,
+                    key_filename=server.key_file,
+                    timeout=self.ssh_timeout,
+                    banner_timeout=self.ssh_timeout,
+                    auth_timeout=self.ssh_timeout
                 )
+        else:
+            ssh.connect(
+                hostname,
+                username=server.username,
+                timeout=self.ssh_timeout,
+                banner_timeout=self.ssh_timeout,
+                auth_timeout=self.ssh_timeout
+            )
+        
+        # Keep pooled connections from being dropped while idle
+        if self.ssh_keepalive:
+            ssh.get_transport().set_keepalive(self.ssh_keepalive)
+        
+        with self._ssh_pool_lock:
+            stale = self._ssh_pool.get(hostname)
+            self._ssh_pool[hostname] = ssh
+        if stale is not None:
+            stale.close()
+        
+        return ssh
+    
+    def close_all(self):
+        """Close all pooled SSH connections"""
+        for helper in self._helper_channels.values():
+            if helper is not None:
+                helper[0].close()
+        self._helper_channels.clear()
+        
+        with self._ssh_pool_lock:
+            for ssh in self._ssh_pool.values():
+                ssh.close()
+            self._ssh_pool.clear()
+    
+    def connect_and_execute(self, server, command, decode=True, errors=None):
+        """
+        Execute command on remote server via SSH, returning bytes if decode is False.
+        
+        Error messages are printed, or appended to errors if a list is given.
+        """
+        try:
+            ssh = self._get_client(server)
             
             stdin, stdout, stderr = ssh.exec_command(command)
-            output = stdout.read().decode('utf-8')
+            output = stdout.read()
+            if decode:
+                output = output.decode('utf-8')
             error = stderr.read().decode('utf-8')
             
-            ssh.close()
-            
             if error and not output:
-                print(f"Error from {server['hostname']}: {error}")
+                _report_error(f"Error from {server.hostname}: {error}", errors)
                 return None
             
             return output
             
         except Exception as e:
-            print(f"Connection error to {server['hostname']}: {str(e)}")
+            _report_error(f"Connection error to {server.hostname}: {str(e)}", errors)
             return None
     
-    def parse_output(self, output, server_name):
-        """Parse the JSON output from the Python script"""
+    def connect_and_stream(self, server, command, get_pty=False):
+        """Execute command on remote server and yield decoded output as it arrives"""
         try:
-            jobs_data = json.loads(output)
+            channel = self._get_client(server).get_transport().open_session()
+        except Exception as e:
+            print(f"Connection error to {server.hostname}: {str(e)}")
+            return
+        
+        try:
+            # Short timeout keeps Ctrl+C responsive while the command is idle
+            channel.settimeout(1.0)
+            if get_pty:
+                # With a pty the remote processes get SIGHUP when the channel closes
+                channel.get_pty()
+            channel.exec_command(command)
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            
+            while True:
+                try:
+                    data = channel.recv(65536)
+                except socket.timeout:
+                    if channel.exit_status_ready() and not channel.recv_ready():
+                        break
+                    continue
+                
+                if not data:
+                    break
+                
+                text = decoder.decode(data)
+                if text:
+                    yield text
+        finally:
+            channel.close()
+    
+    def parse_output(self, output, server_name, errors=None):
+        """Parse the JSON output (str or bytes) from the Python script"""
+        try:
+            jobs_data = _json_loads(output)
             jobs = []
             
             for job_data in jobs_data:
-                job = OrderedDict([
-                    ('Server', server_name),
-                    ('JobID', job_data.get('JobID', 'N/A')),
-                    ('Job_Name', job_data.get('Job_Name', 'N/A')),
-                    ('Job_Path', job_data.get('Job_Path', 'N/A')),
-                    ('CPUs', str(job_data.get('CPUs', 'N/A'))),
-                    ('Status', job_data.get('Status', 'N/A')),
-                    ('Owner', job_data.get('Owner', 'N/A')),
-                    ('Memory', job_data.get('Memory', 'N/A'))
-                ])
+                cpus = str(job_data.get('CPUs', 'N/A'))
+                job = {
+                    'Server': server_name,
+                    'JobID': job_data.get('JobID', 'N/A'),
+                    'Job_Name': job_data.get('Job_Name', 'N/A'),
+                    'Job_Path': job_data.get('Job_Path', 'N/A'),
+                    'CPUs': cpus,
+                    'CPUs_int': int(cpus) if cpus.isdigit() else 0,
+                    'Status': job_data.get('Status', 'N/A'),
+                    'Owner': job_data.get('Owner', 'N/A'),
+                    'Memory': job_data.get('Memory', 'N/A')
+                }
                 jobs.append(job)
             
             return jobs
             
-        except json.JSONDecodeError as e:
-            print(f"Error parsing JSON from {server_name}: {str(e)}")
+        except ValueError as e:
+            # Also covers UnicodeDecodeError from json.loads on raw bytes
+            _report_error(f"Error parsing JSON from {server_name}: {str(e)}", errors)
             return []
     
+    def _open_helper(self, client):
+        """Start the remote script in server mode on client, None if it does not support it"""
+        channel = client.get_transport().open_session()
+        channel.settimeout(self.ssh_timeout)
+        channel.exec_command(f"python3 {self.script_path} --server-mode")
+        stdin = channel.makefile('wb')
+        stdout = channel.makefile('rb')
+        
+        # Scripts without server mode ignore the flag and print the job list
+        if stdout.readline().strip() != b'READY':
+            channel.close()
+            return None
+        
+        # Job queries may legitimately take longer than the connect timeout
+        channel.settimeout(None)
+        return channel, stdin, stdout
+    
+    def _query_helper(self, server):
+        """
+        Request the job list bytes from the persistent helper, None if unavailable.
+        
+        Connection errors are raised; only helper failures return None.
+        """
+        hostname = server.hostname
+        helper = self._helper_channels.get(hostname)
+        if helper is None and hostname in self._helper_channels:
+            return None
+        
+        # Connect outside the try so a down server is not retried via --json
+        needs_open = helper is None or helper[0].closed or helper[0].exit_status_ready()
+        client = self._get_client(server) if needs_open else None
+        
+        try:
+            if needs_open:
+                helper = self._open_helper(client)
+                self._helper_channels[hostname] = helper
+                if helper is None:
+                    return None
+            
+            channel, stdin, stdout = helper
+            stdin.write(b"LIST\n")
+            stdin.flush()
+            line = stdout.readline()
+            if not line:
+                raise EOFError("helper exited")
+            if not line.startswith(b'['):
+                raise ValueError("unexpected helper reply")
+            return line
+            
+        except Exception:
+            # Drop the broken helper; it is restarted on the next fetch
+            if helper is not None:
+                helper[0].close()
+            self._helper_channels.pop(hostname, None)
+            return None
+    
+    def _fetch_server_jobs(self, server):
+        """Fetch and parse jobs from a single server as (jobs or None on failure, error messages)"""
+        # Runs in a worker thread, so messages are returned for the caller to print in order
+        errors = []
+        try:
+            output = self._query_helper(server)
+        except Exception as e:
+            # Report the unreachable server once instead of connecting again
+            errors.append(f"Connection error to {server.hostname}: {str(e)}")
+            return None, errors
+        
+        if output is None:
+            command = f"python3 {self.script_path} --json"
+            output = self.connect_and_execute(server, command, decode=False, errors=errors)
+        
+        if output:
+            return self.parse_output(output, server.name, errors), errors
+        return None, errors
+    
     def fetch_all_jobs(self):
         """Fetch jobs from all servers"""
         self.all_jobs = []
+        self._sorted_cache.clear()
         
         print("\n🔄 Fetching jobs from all servers...\n")
         
-        for server in self.servers:
-            print(f"📡 Connecting to {server['name']}...", end=' ')
-            
-            command = f"python3 {self.script_path} --json"
-            output = self.connect_and_execute(server, command)
+        # Query all servers concurrently; total latency is the slowest server
+        max_workers = min(32, len(self.servers))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._fetch_server_jobs, server) for server in self.servers]
+        
+        # Report in configuration order so the output stays readable
+        for server, future in zip(self.servers, futures):
+            print(f"📡 Connecting to {server.name}...", end=' ')
             
-            if output:
-                jobs = self.parse_output(output, server['name'])
+            jobs, errors = future.result()
+            for message in errors:
+                print(message)
+            if jobs is not None:
                 self.all_jobs.extend(jobs)
                 print(f"✓ Found {len(jobs)} jobs")
             else:
                 print("✗ Failed")
         
+        self._index_jobs()
+        
         print(f"\n📊 Total jobs found: {len(self.all_jobs)}\n")
         return self.all_jobs
     
+    def _index_jobs(self):
+        """Rebuild the JobID, status and owner indexes over all_jobs"""
+        self._job_by_id = {}
+        self._job_by_prefix = {}
+        self.jobs_by_status = {}
+        self.jobs_by_owner = {}
+        
+        for job in self.all_jobs:
+            self._job_by_id[job['JobID']] = job
+            self._job_by_prefix.setdefault(job['JobID'].split('.', 1)[0], job)
+            self.jobs_by_status.setdefault(job['Status'], []).append(job)
+            self.jobs_by_owner.setdefault(job['Owner'], []).append(job)
+    
+    def find_job(self, job_id):
+        """Find a job by full ID, numeric ID, or any part of the ID"""
+        job = self._job_by_id.get(job_id) or self._job_by_prefix.get(job_id)
+        if job is not None:
+            return job
+        
+        # Fall back to a substring match for other partial IDs
+        for job in self.all_jobs:
+            if job_id in job['JobID']:
+                return job
+        return None
+    
     def display_jobs(self, jobs=None, sort_by='JobID'):
         """Display jobs in a formatted table"""
+        # Only the full job list is cached; filtered lists are sorted each time
+        cache_key = sort_by if jobs is None else None
         if jobs is None:
             jobs = self.all_jobs
         
@@ -273,10 +574,15 @@ class PBSJobManager:
             return
         
         # Sort jobs
-        if sort_by in ['CPUs']:
-            jobs = sorted(jobs, key=lambda x: int(x[sort_by]) if x[sort_by].isdigit() else 0)
+        if cache_key in self._sorted_cache:
+            jobs = self._sorted_cache[cache_key]
         else:
-            jobs = sorted(jobs, key=lambda x: x[sort_by])
+            if sort_by in ['CPUs']:
+                jobs = sorted(jobs, key=lambda x: x['CPUs_int'])
+            else:
+                jobs = sorted(jobs, key=lambda x: x[sort_by])
+            if cache_key is not None:
+                self._sorted_cache[cache_key] = jobs
         
         # Define column widths
         widths = {
@@ -290,72 +596,80 @@ class PBSJobManager:
             'Memory': 10
         }
         
-        # Print header
-        header = ""
-        separator = ""
-        for field, width in widths.items():
-            header += f"{field:<{width}} "
-            separator += "-" * width + " "
+        # Build the row template once and write the whole table in one call
+        row_fmt = ' '.join(f"{{:<{width}}}" for width in widths.values()) + ' '
+        lines = [
+            row_fmt.format(*widths),
+            ' '.join('-' * width for width in widths.values()) + ' '
+        ]
         
-        print(header)
-        print(separator)
-        
-        # Print jobs
+        columns = list(widths.items())
         for job in jobs:
-            row = ""
-            for field, width in widths.items():
+            values = []
+            for field, width in columns:
                 value = job.get(field, 'N/A')
                 if len(value) > width - 1:
                     value = value[:width-4] + "..."
-                row += f"{value:<{width}} "
-            print(row)
+                values.append(value)
+            lines.append(row_fmt.format(*values))
         
-        print()
+        sys.stdout.write('\n'.join(lines) + '\n\n')
     
     def kill_job(self, job_id, server_hostname=None):
         """Kill a job on specified server"""
         # If server not specified, try to find it from job list
         job_path = ""
         if not server_hostname:
-            for job in self.all_jobs:
-                if job_id in job['JobID']:
-                    server_hostname = job['Server']
-                    job_path = job['Job_Path']
-                    break
+            job = self.find_job(job_id)
+            if job:
+                server_hostname = job['Server']
+                job_path = job['Job_Path']
         
         if not server_hostname:
             print(f"❌ Could not determine server for job {job_id}")
             return False
         
         # Find the server config
-        server = None
-        for s in self.servers:
-            if s['name'] == server_hostname:
-                server = s
-                break
+        server = self.server_by_name.get(server_hostname)
         
         if not server:
             print(f"❌ Server {server_hostname} not found in configuration")
             return False
         
+        # Ask before killing so qdel and the optional cleanup share one SSH command
+        delete_dir = False
+        if job_path:
+            del_dir = input("\nDelete job directory after killing (y/n): ").strip()
+            if del_dir == 'y':
+                delete_dir = True
+            elif del_dir != 'n':
+                print(f"❌ Invalid choice\n")
+                return False
+        
         print(f"\n🗑️  Killing job {job_id} on {server_hostname}...")
         
         command = f"{self.qdel_path} {job_id}"
+        if delete_dir:
+            # rm problems go to stdout with a marker so they can't be mistaken
+            # for a qdel failure
+            command += f" && {{ rm -rf {shlex.quote(job_path)} 2>&1 || echo RM_FAILED; }}"
         output = self.connect_and_execute(server, command)
         
         if output is not None:
+            output = output.strip()
+            rm_failed = delete_dir and output.endswith('RM_FAILED')
+            if rm_failed:
+                output = output[:-len('RM_FAILED')].strip()
+            
             print(f"✓ Job {job_id} killed successfully!")
-            if output.strip():
-                print(f"  Output: {output.strip()}")
-            del_dir = input("\nDelete job directory (y/n): ").strip()
-            if del_dir == 'y':
-                command = f"rm -rf {job_path}"
-                output = self.connect_and_execute(server, command)
+            if output:
+                print(f"  Output: {output}")
+            if rm_failed:
+                print(f"✗ Failed to delete source directory: {job_path}\n")
+            elif delete_dir:
                 print(f"✓ Deleted source directory: {job_path}\n")
-            elif del_dir == 'n':
+            elif job_path:
                 print(f"✓ Retained source directory: {job_path}\n")
-            else:
-                print(f"❌ Invalid choice\n")
                 
             return True
         else:
@@ -365,12 +679,7 @@ class PBSJobManager:
     def view_log(self, job_id_input):
         """View log file for a job (like tail -f)"""
         # Find the job in our list
-        matched_job = None
-        
-        for job in self.all_jobs:
-            if job_id_input in job['JobID'] or job['JobID'].startswith(job_id_input + '.'):
-                matched_job = job
-                break
+        matched_job = self.find_job(job_id_input)
         
         if not matched_job:
             print(f"\n❌ Job ID '{job_id_input}' not found in current job list")
@@ -382,24 +691,26 @@ class PBSJobManager:
         log_file = f"{job_path}/Simulation/messag"
         
         # Find the server config
-        server = None
-        for s in self.servers:
-            if s['name'] == server_hostname:
-                server = s
-                break
+        server = self.server_by_name.get(server_hostname)
         
         if not server:
             print(f"❌ Server {server_hostname} not found in configuration")
             return False
         
-        # Check if log file exists
-        check_cmd = f"test -f {log_file} && echo 'EXISTS' || echo 'NOT_FOUND'"
-        result = self.connect_and_execute(server, check_cmd)
+        # Check the log exists, read its size and its last 50 lines in one round trip
+        size_cmd = f"stat -c %s {log_file} 2>/dev/null || stat -f %z {log_file}"
+        open_cmd = (
+            f"if [ -f {log_file} ]; then {size_cmd}; echo '---'; tail -n 50 {log_file}; "
+            f"else echo 'NOT_FOUND'; fi"
+        )
+        result = self.connect_and_execute(server, open_cmd)
         
-        if not result or 'NOT_FOUND' in result:
+        if not result or result.strip() == 'NOT_FOUND':
             print(f"\n❌ Log file not found: {log_file}")
             return False
         
+        size_output, _, initial_output = result.partition('\n---\n')
+        
         print(f"\n📄 Viewing log for job: {matched_job['JobID']}")
         print(f"   Job Name: {matched_job['Job_Name']}")
         print(f"   Server: {server_hostname}")
@@ -408,57 +719,123 @@ class PBSJobManager:
         print("Press Ctrl+C to stop watching the log")
         print('=' * 70 + '\n')
         
-        # Get initial content (last 50 lines)
-        initial_cmd = f"tail -n 50 {log_file}"
-        initial_output = self.connect_and_execute(server, initial_cmd)
-        
+        # Show initial content (last 50 lines)
         if initial_output:
             print(initial_output)
         
         # Keep track of file size for detecting new content
         prev_size = 0
-        size_cmd = f"stat -c %s {log_file} 2>/dev/null || stat -f %z {log_file}"
-        size_result = self.connect_and_execute(server, size_cmd)
-        if size_result and size_result.strip().isdigit():
-            prev_size = int(size_result.strip())
+        if size_output.strip().isdigit():
+            prev_size = int(size_output.strip())
         
         try:
-            while True:
-                time.sleep(3)
-                
-                # Check current file size
-                size_result = self.connect_and_execute(server, size_cmd)
-                if not size_result or not size_result.strip().isdigit():
-                    continue
-                
-                current_size = int(size_result.strip())
-                
-                # If file grew, get new content
-                if current_size > prev_size:
-                    # Get new bytes
-                    bytes_to_read = current_size - prev_size
-                    new_content_cmd = f"tail -c {bytes_to_read} {log_file}"
-                    new_content = self.connect_and_execute(server, new_content_cmd)
-                    
-                    if new_content:
-                        print(new_content, end='', flush=True)
-                    
-                    prev_size = current_size
-                elif current_size < prev_size:
-                    # File was truncated or replaced
-                    print(f"\n[Log file was reset/truncated]\n")
-                    new_content_cmd = f"tail -n 50 {log_file}"
-                    new_content = self.connect_and_execute(server, new_content_cmd)
-                    if new_content:
-                        print(new_content)
-                    prev_size = current_size
-                
+            # inotify only sees writes made on the server itself, not by compute
+            # nodes on a shared filesystem, so it has to be enabled per server
+            followed = False
+            if server.inotify_logs and self._inotify_available(server):
+                followed = self._follow_log_inotify(server, log_file, prev_size)
+            if not followed:
+                self._follow_log_polling(server, log_file, size_cmd, prev_size)
         except KeyboardInterrupt:
             print(f"\n\n{'=' * 70}")
             print("✓ Stopped watching log file")
             print('=' * 70 + '\n')
             return True
     
+    def _inotify_available(self, server):
+        """Check once per server whether inotifywait can be used remotely"""
+        hostname = server.hostname
+        if hostname not in self._has_inotify:
+            result = self.connect_and_execute(
+                server, "command -v inotifywait >/dev/null 2>&1 && echo YES || echo NO")
+            self._has_inotify[hostname] = bool(result) and result.strip() == 'YES'
+        return self._has_inotify[hostname]
+    
+    def _follow_log_inotify(self, server, log_file, prev_size):
+        """Stream new log content as inotifywait reports modifications, False if it never started"""
+        # The remote loop tracks the offset itself, so bytes are only sent
+        # when the file actually changes. inotifywait reports on stderr once
+        # its watch is set up; that line is turned into a start marker and
+        # anything else it prints (e.g. watch limit errors) is passed through.
+        marker = '@@LOG_FOLLOW_STARTED@@'
+        follow_cmd = (
+            f"prev={prev_size}; "
+            f"inotifywait -m -e modify --format '%e' {log_file} 2>&1 | while read ev; do "
+            f"case \"$ev\" in "
+            f"MODIFY) "
+            f"sz=$(stat -c %s {log_file}); "
+            f"if [ \"$sz\" -gt \"$prev\" ]; then "
+            f"tail -c +$((prev + 1)) {log_file} | head -c $((sz - prev)); "
+            f"elif [ \"$sz\" -lt \"$prev\" ]; then "
+            f"printf '\\n[Log file was reset/truncated]\\n\\n'; tail -n 50 {log_file}; fi; "
+            f"prev=$sz ;; "
+            f"'Watches established.') echo '{marker}' ;; "
+            f"'Setting up watches.') ;; "
+            f"*) echo \"$ev\" ;; "
+            f"esac; done"
+        )
+        
+        # Output before the marker can only be an inotifywait error
+        pending = ''
+        started = False
+        for chunk in self.connect_and_stream(server, follow_cmd, get_pty=True):
+            if started:
+                print(chunk, end='', flush=True)
+                continue
+            
+            pending += chunk
+            before, found, after = pending.partition(marker)
+            if found:
+                started = True
+                after = after.lstrip('\r\n')
+                if after:
+                    print(after, end='', flush=True)
+        
+        if not started:
+            if pending.strip():
+                print(pending.strip())
+            print("[inotifywait could not watch the log, polling instead]\n")
+            return False
+        
+        print("\n[Log stream closed by server]")
+        return True
+    
+    def _follow_log_polling(self, server, log_file, size_cmd, prev_size):
+        """Poll the log file every few seconds and print new content"""
+        while True:
+            time.sleep(3)
+            
+            # Stat the file and fetch any new bytes in a single round trip;
+            # the first output line is the current size, the rest is content
+            tick_cmd = (
+                f"sz=$({size_cmd}); echo \"$sz\"; "
+                f"if [ \"$sz\" -gt {prev_size} ]; then "
+                f"tail -c +{prev_size + 1} {log_file} | head -c $((sz - {prev_size})); "
+                f"elif [ \"$sz\" -lt {prev_size} ]; then tail -n 50 {log_file}; fi"
+            )
+            tick_result = self.connect_and_execute(server, tick_cmd)
+            if not tick_result:
+                continue
+            
+            size_line, _, new_content = tick_result.partition('\n')
+            if not size_line.strip().isdigit():
+                continue
+            
+            current_size = int(size_line.strip())
+            
+            # If file grew, show the new bytes
+            if current_size > prev_size:
+                if new_content:
+                    print(new_content, end='', flush=True)
+                
+                prev_size = current_size
+            elif current_size < prev_size:
+                # File was truncated or replaced
+                print(f"\n[Log file was reset/truncated]\n")
+                if new_content:
+                    print(new_content)
+                prev_size = current_size
+    
     def windows_to_linux_path(self, windows_path):
         """Convert Windows path to Linux path and determine server"""
         windows_path = os.path.abspath(windows_path)
@@ -480,23 +857,65 @@ class PBSJobManager:
         abs_path = os.path.abspath(path)
         return abs_path[0].upper() if len(abs_path) > 0 else None
     
-    def copy_directory_contents(self, source, destination):
-        """Copy all contents from source to destination"""
+    def _stream_directory_to_server(self, source, server, linux_dest):
+        """Stream source as a tar archive over SSH and extract it into linux_dest"""
+        dest = shlex.quote(linux_dest)
+        channel = self._get_client(server).get_transport().open_session()
         try:
-            if not os.path.exists(destination):
-                os.makedirs(destination)
-                print(f"✓ Created directory: {destination}")
-            
-            print(f"📁 Copying files from {source} to {destination}...")
+            channel.exec_command(f"mkdir -p {dest} && tar -xf - -C {dest}")
+            stream = channel.makefile('wb')
+            with tarfile.open(fileobj=stream, mode='w|') as tar:
+                tar.add(source, arcname='.')
+            stream.flush()
+            channel.shutdown_write()
             
+            if channel.recv_exit_status() != 0:
+                error = channel.makefile_stderr('rb').read().decode('utf-8', 'replace')
+                raise RuntimeError(error.strip() or "remote tar failed")
+        finally:
+            channel.close()
+    
+    def _copy_tree_local(self, source, destination):
+        """Copy the entries of source into destination, subtrees in parallel"""
+        if not os.path.exists(destination):
+            os.makedirs(destination)
+            print(f"✓ Created directory: {destination}")
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            futures = []
             for item in os.listdir(source):
                 source_item = os.path.join(source, item)
                 dest_item = os.path.join(destination, item)
                 
                 if os.path.isdir(source_item):
-                    shutil.copytree(source_item, dest_item)
+                    futures.append(executor.submit(
+                        shutil.copytree, source_item, dest_item, dirs_exist_ok=True))
                 else:
-                    shutil.copy2(source_item, dest_item)
+                    futures.append(executor.submit(shutil.copy2, source_item, dest_item))
+        
+        # Re-raise the first copy error, if any
+        for future in futures:
+            future.result()
+    
+    def copy_directory_contents(self, source, destination):
+        """Copy all contents from source to destination"""
+        try:
+            print(f"📁 Copying files from {source} to {destination}...")
+            
+            # Destinations on a mapped drive are written directly on the server
+            # as one tar stream instead of one network round trip per file
+            server_hostname, linux_dest = self.windows_to_linux_path(destination)
+            server = self.server_by_host.get(server_hostname)
+            
+            if server:
+                try:
+                    self._stream_directory_to_server(source, server, linux_dest)
+                    print(f"✓ Successfully copied all files\n")
+                    return True
+                except Exception as e:
+                    print(f"⚠️  Streaming copy failed ({str(e)}), copying through the mapped drive")
+            
+            self._copy_tree_local(source, destination)
             
             print(f"✓ Successfully copied all files\n")
             return True
@@ -562,14 +981,14 @@ class PBSJobManager:
                 # Ask for server
                 print("Available servers:")
                 for i, srv in enumerate(self.servers, 1):
-                    drive_letter = self.server_to_drive.get(srv['hostname'], '?')
-                    print(f"  [{i}] {srv['name']} (Drive {drive_letter}:)")
+                    drive_letter = self.server_to_drive.get(srv.hostname, '?')
+                    print(f"  [{i}] {srv.name} (Drive {drive_letter}:)")
                 
                 srv_choice = input("\nSelect server (number): ").strip()
                 try:
                     srv_idx = int(srv_choice) - 1
                     if 0 <= srv_idx < len(self.servers):
-                        server_hostname = self.servers[srv_idx]['hostname']
+                        server_hostname = self.servers[srv_idx].hostname
                     else:
                         print("❌ Invalid server selection")
                         return False
@@ -636,11 +1055,7 @@ class PBSJobManager:
             script_name = self.submit_script_name
         
         # Find the server config
-        server = None
-        for s in self.servers:
-            if s['hostname'] == server_hostname:
-                server = s
-                break
+        server = self.server_by_host.get(server_hostname)
         
         if not server:
             print(f"❌ Server {server_hostname} not found in configuration")
@@ -751,72 +1166,75 @@ def main():
     # Display configured servers
     print(f"\n🖥️  Configured servers:")
     for srv in manager.servers:
-        drive = manager.server_to_drive.get(srv['hostname'], '?')
-        print(f"   - {srv['name']} ({srv['hostname']}) -> Drive {drive}:")
+        drive = manager.server_to_drive.get(srv.hostname, '?')
+        print(f"   - {srv.name} ({srv.hostname}) -> Drive {drive}:")
     
-    # Initial fetch
-    manager.fetch_all_jobs()
-    
-    while True:
-        print_menu()
-        choice = input("Enter your choice: ").strip()
+    try:
+        # Initial fetch
+        manager.fetch_all_jobs()
         
-        if choice == '0':
-            print("\n👋 Goodbye!\n")
-            break
-            
-        elif choice == '1':
-            manager.display_jobs()
-            
-        elif choice == '2':
-            sort_by = get_sort_menu()
-            manager.display_jobs(sort_by=sort_by)
+        while True:
+            print_menu()
+            choice = input("Enter your choice: ").strip()
             
-        elif choice == '3':
-            status = input("\nEnter status (R/Q): ").strip().upper()
-            filtered = [j for j in manager.all_jobs if j['Status'] == status]
-            print(f"\n📋 Jobs with status '{status}':\n")
-            manager.display_jobs(filtered)
-            
-        elif choice == '4':
-            owner = input("\nEnter owner username: ").strip()
-            filtered = [j for j in manager.all_jobs if j['Owner'] == owner]
-            print(f"\n📋 Jobs owned by '{owner}':\n")
-            manager.display_jobs(filtered)
-            
-        elif choice == '5':
-            manager.submit_job_interactive()
-            
-        elif choice == '6':
-            print("\n" + "=" * 70)
-            print("                     Kill Job")
-            print("=" * 70)
-            
-            job_id = input("\nEnter Job ID (or partial ID): ").strip()
+            if choice == '0':
+                print("\n👋 Goodbye!\n")
+                break
+                
+            elif choice == '1':
+                manager.display_jobs()
+                
+            elif choice == '2':
+                sort_by = get_sort_menu()
+                manager.display_jobs(sort_by=sort_by)
+                
+            elif choice == '3':
+                status = input("\nEnter status (R/Q): ").strip().upper()
+                filtered = manager.jobs_by_status.get(status, [])
+                print(f"\n📋 Jobs with status '{status}':\n")
+                manager.display_jobs(filtered)
+                
+            elif choice == '4':
+                owner = input("\nEnter owner username: ").strip()
+                filtered = manager.jobs_by_owner.get(owner, [])
+                print(f"\n📋 Jobs owned by '{owner}':\n")
+                manager.display_jobs(filtered)
+                
+            elif choice == '5':
+                manager.submit_job_interactive()
+                
+            elif choice == '6':
+                print("\n" + "=" * 70)
+                print("                     Kill Job")
+                print("=" * 70)
+                
+                job_id = input("\nEnter Job ID (or partial ID): ").strip()
+                
+                if manager.kill_job(job_id):
+                    input("\nPress Enter to refresh job list...")
+                    manager.fetch_all_jobs()
+                    manager.display_jobs()
             
-            if manager.kill_job(job_id):
-                input("\nPress Enter to refresh job list...")
+            elif choice == '7':
+                manager.display_jobs()
+                print("\n" + "=" * 70)
+                print("                     View Job Log")
+                print("=" * 70)
+                
+                job_id = input("\nEnter Job ID (or partial ID): ").strip()
+                manager.view_log(job_id)
+                    
+            elif choice == '8':
                 manager.fetch_all_jobs()
                 manager.display_jobs()
-        
-        elif choice == '7':
-            manager.display_jobs()
-            print("\n" + "=" * 70)
-            print("                     View Job Log")
-            print("=" * 70)
-            
-            job_id = input("\nEnter Job ID (or partial ID): ").strip()
-            manager.view_log(job_id)
                 
-        elif choice == '8':
-            manager.fetch_all_jobs()
-            manager.display_jobs()
+            else:
+                print("\n❌ Invalid choice. Please try again.\n")
             
-        else:
-            print("\n❌ Invalid choice. Please try again.\n")
-        
-        input("\nPress Enter to continue...")
-        print("\n" * 2)
+            input("\nPress Enter to continue...")
+            print("\n" * 2)
+    finally:
+        manager.close_all()
 
 
 if __name__ == "__main__":
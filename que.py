@@ -1,76 +1,399 @@
 #!/usr/bin/env python3
 
-from collections import OrderedDict
 import subprocess as sp
+import ctypes
 import json
 import sys
+import itertools
+import os
 import re
+import socket
+import stat
+import tempfile
+import time
+
+# Prefer a native JSON parser; the stdlib one is the fallback
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    try:
+        import ujson
+        
+        def _json_loads(data):
+            # ujson only accepts str and bytes, not the bytearray qstat output
+            if isinstance(data, bytearray):
+                data = bytes(data)
+            return ujson.loads(data)
+    except ImportError:
+        _json_loads = json.loads
+
+# Without orjson, ijson's C backends parse the job listing one job at a time
+# faster than a full stdlib parse; orjson and the pure-Python ijson backend are
+# faster as a full parse
+try:
+    import ijson
+    if orjson is not None or ijson.backend not in ('yajl2_c', 'yajl2_cffi'):
+        ijson = None
+except ImportError:
+    ijson = None
+
+QSTAT_CMD = ['/opt/pbs/bin/qstat','-f','-Fjson']
+
+LIBPBS_PATH = '/opt/pbs/lib/libpbs.so'
+
+# Cleaned qstat output is reused for this many seconds by back-to-back calls
+QSTAT_CACHE_TTL = 2
+QSTAT_CACHE_PATH = os.path.join(tempfile.gettempdir(), "qstat_cache_{0}_{1}.json".format(
+    socket.gethostname(), os.getuid()))
+
+# qstat emits values that are not valid JSON; these fixups are made in one pass.
+# The alternatives share the leading quote so each candidate position is
+# tested once before branching on the key name.
+_FIXUP_RE = re.compile(
+    rb'"(?:Job_Name":(?:inf|\d+),'
+    rb'|(expl|rho_low|rho_high)":[+\-]?(?:0|[1-9]\d*)(?:\.\d*)?(?:[eE][+\-]?\d+))')
+
+# The unquoted PBS_O_PATH entry is dropped with plain byte searches instead
+_PBS_O_PATH_KEY = b'"PBS_O_PATH":'
+
+def _fixup(match):
+    """Return the replacement for one _FIXUP_RE match"""
+    name = match.group(1)
+    if name is not None:
+        return b'"%s":"float"' % name
+    return b'"Job_Name":"Unknown",'
+
+def _fixup_into(out, buf, end):
+    """Append buf[:end] to the bytearray out with all fixups applied"""
+    has_path = buf.find(_PBS_O_PATH_KEY, 0, end) >= 0
+    view = memoryview(buf)
+    pos = 0
+    while pos < end:
+        # Cut out the next PBS_O_PATH entry, which runs from the key to the
+        # last comma on its line
+        seg_end = skip_to = end
+        key = buf.find(_PBS_O_PATH_KEY, pos, end) if has_path else -1
+        if key >= 0:
+            line_end = buf.find(b'\n', key, end)
+            if line_end < 0:
+                line_end = end
+            comma = buf.rfind(b',', key + len(_PBS_O_PATH_KEY) + 1, line_end)
+            if comma >= 0:
+                seg_end, skip_to = key, comma + 1
+            else:
+                seg_end = skip_to = line_end
+
+        last = pos
+        for match in _FIXUP_RE.finditer(buf, pos, seg_end):
+            out += view[last:match.start()]
+            out += _fixup(match)
+            last = match.end()
+        out += view[last:seg_end]
+        pos = skip_to
+
+def read_qstat_output():
+    """Run qstat and return its output as a bytearray, fixing it up while qstat is still writing"""
+    proc = sp.Popen(QSTAT_CMD, stdout=sp.PIPE, bufsize=65536)
+    out = bytearray()
+    pending = b''
+    # Every fixup is inside the Jobs object, so output before it (all of it
+    # for an idle queue) is copied as is
+    in_jobs = False
+    while True:
+        block = proc.stdout.read1(65536)
+        eof = not block
+        # qstat writes one key per line, so complete lines can be fixed up
+        # independently of the rest of the output
+        pending += block
+        cut = len(pending) if eof else pending.rfind(b'\n') + 1
+        if cut:
+            in_jobs = in_jobs or b'"Jobs"' in pending
+            if in_jobs:
+                _fixup_into(out, pending, cut)
+            else:
+                out += memoryview(pending)[:cut]
+            pending = pending[cut:]
+        if eof:
+            break
+    proc.stdout.close()
+    if proc.wait() != 0:
+        raise sp.CalledProcessError(proc.returncode, QSTAT_CMD)
+    # The sentinel is rare; only copy the buffer when it is present
+    if b'^"^^' in out:
+        out = out.replace(b'^"^^', b'')
+    # Returned as is; every consumer accepts a bytearray and a bytes() copy
+    # would double peak memory
+    return out
+
+def cached_qstat_output():
+    """Return cleaned qstat output, reusing a result newer than QSTAT_CACHE_TTL"""
+    try:
+        st = os.lstat(QSTAT_CACHE_PATH)
+        # Only trust a regular file we own in the shared temp directory
+        if (stat.S_ISREG(st.st_mode) and st.st_uid == os.getuid()
+                and st.st_mtime > time.time() - QSTAT_CACHE_TTL):
+            with open(QSTAT_CACHE_PATH, 'rb') as f:
+                return f.read()
+    except OSError:
+        pass
+    
+    clean_qstat_output = read_qstat_output()
+    tmp_path = "{0}.{1}".format(QSTAT_CACHE_PATH, os.getpid())
+    created = False
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        created = True
+        with os.fdopen(fd, 'wb') as f:
+            f.write(clean_qstat_output)
+        os.replace(tmp_path, QSTAT_CACHE_PATH)
+    except OSError:
+        # The cache is best effort, but don't leave our partial file behind
+        if created:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    return clean_qstat_output
+
+def _parse_qstat_json(clean_qstat_output):
+    """Parse cleaned qstat bytes, only decoding away invalid UTF-8 if that fails"""
+    try:
+        return _json_loads(clean_qstat_output)
+    except ValueError:
+        return _json_loads(clean_qstat_output.decode("utf-8","ignore"))
+
+def _report_parse_error(err, clean_qstat_output):
+    """Dump the unparseable qstat output to que.error.log and exit"""
+    sys.stderr.write("{0}\n".format(err))
+    sys.stderr.write("Error reading queue. See que.error.log\n")
+    with open("que.error.log", 'wb') as f:
+        f.write(clean_qstat_output)
+    sys.exit(1)
 
 def get_qstat_json():
     """Call qstat for JSON data"""
-    qstat_output = sp.check_output(['/opt/pbs/bin/qstat','-f','-Fjson'])
-    clean_qstat_output = qstat_output.replace(
-            b'"Job_Name":inf,',b'"Job_Name":"Unknown",') #.replace(b'\\', b'\\\\')
-    clean_qstat_output = re.sub(b'"Job_Name":\d+,', b'"Job_Name":"Unknown",', clean_qstat_output)
-    clean_qstat_output = re.sub(b'"PBS_O_PATH":\S+,', b'', clean_qstat_output)
-    for i in [b'expl', b'rho_low', b'rho_high']:
-        clean_qstat_output = re.sub(b'"' + i + b'":[+\-]?(?:0|[1-9]\d*)(?:\.\d*)?(?:[eE][+\-]?\d+)', 
-                b'"' + i + b'":"float"', clean_qstat_output)
+    clean_qstat_output = cached_qstat_output()
     try:
-        results = json.loads(clean_qstat_output.decode("utf-8","ignore").replace('^"^^',''),
-                      object_pairs_hook=OrderedDict)
-    except json.decoder.JSONDecodeError as err:
-        sys.stderr.write("{0}\n".format(err))
-        sys.stderr.write("Error reading queue. See que.error.log\n")
-        with open("que.error.log", 'w') as f:
-            for line in clean_qstat_output.decode("utf-8","ignore"):
-                f.write(line)
-        sys.exit(1)
+        results = _parse_qstat_json(clean_qstat_output)
+    except ValueError as err:
+        _report_parse_error(err, clean_qstat_output)
     return results
-    
 
-def get_job_directory(json_data) :
-    """Obtain working directory of PBS job"""
-    jobDir = OrderedDict()
-    if "Jobs" in json_data.keys() :
-        for jobid, job in json_data["Jobs"].items():
-            jobDir[jobid] = OrderedDict()
-            jobDir[jobid]["Job_Name"]      = job["Job_Name"]
-            jobDir[jobid]["Job Path"]      = job['Variable_List']['PBS_O_WORKDIR']
-            jobDir[jobid]["CPUs"]          = job['resources_used']['ncpus']
-            jobDir[jobid]["Status"]        = job['job_state']
-            jobDir[jobid]["Owner"]         = job['Job_Owner'].split('@')[0]
-            if job['resources_used']['mem'][-2:] == "kb" :
-                jobMem     = float(job['resources_used']['mem'][:-2])/1024
-                if jobMem > 1024 :
-                    jobMem = jobMem/1024
-                    jobDir[jobid]["Memory"]     = str(round(jobMem,1))+'Gb' 
-                else :
-                    jobDir[jobid]["Memory"]     = str(round(jobMem,1))+'Mb' 
-            else :
-                jobMem     = job['resources_used']['mem']
-    return jobDir
+class _Attrl(ctypes.Structure):
+    """struct attrl from pbs_ifl.h"""
+
+_Attrl._fields_ = [
+    ('next', ctypes.POINTER(_Attrl)),
+    ('name', ctypes.c_char_p),
+    ('resource', ctypes.c_char_p),
+    ('value', ctypes.c_char_p),
+    ('op', ctypes.c_int),
+]
+
+class _BatchStatus(ctypes.Structure):
+    """struct batch_status from pbs_ifl.h"""
+
+_BatchStatus._fields_ = [
+    ('next', ctypes.POINTER(_BatchStatus)),
+    ('name', ctypes.c_char_p),
+    ('attribs', ctypes.POINTER(_Attrl)),
+    ('text', ctypes.c_char_p),
+]
+
+# The only job attributes the job list needs from the server
+_STAT_ATTRIBUTES = [b'Job_Name', b'Job_Owner', b'job_state', b'resources_used', b'Variable_List']
+
+# Variable_List entries are separated by commas not escaped with a backslash
+_VARIABLE_SPLIT_RE = re.compile(r'(?<!\\),')
+
+def _load_libpbs():
+    """Load libpbs and declare the functions used, None if unavailable"""
+    try:
+        lib = ctypes.CDLL(LIBPBS_PATH)
+    except OSError:
+        return None
+    lib.pbs_default.restype = ctypes.c_char_p
+    lib.pbs_default.argtypes = []
+    lib.pbs_connect.restype = ctypes.c_int
+    lib.pbs_connect.argtypes = [ctypes.c_char_p]
+    lib.pbs_statjob.restype = ctypes.POINTER(_BatchStatus)
+    lib.pbs_statjob.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.POINTER(_Attrl), ctypes.c_char_p]
+    lib.pbs_statfree.restype = None
+    lib.pbs_statfree.argtypes = [ctypes.POINTER(_BatchStatus)]
+    lib.pbs_disconnect.restype = ctypes.c_int
+    lib.pbs_disconnect.argtypes = [ctypes.c_int]
+    return lib
+
+def _pbs_errno(lib):
+    """Return pbs_errno after a libpbs call, None if it cannot be read"""
+    # Threaded builds define pbs_errno as (*__pbs_errno_location())
+    try:
+        location = lib.__pbs_errno_location
+    except AttributeError:
+        try:
+            return ctypes.c_int.in_dll(lib, 'pbs_errno').value
+        except ValueError:
+            return None
+    location.restype = ctypes.POINTER(ctypes.c_int)
+    location.argtypes = []
+    return location().contents.value
+
+def _parse_variable_list(value):
+    """Split a PBS Variable_List string (NAME=value,... with \\, escapes) into a dict"""
+    variables = {}
+    for item in _VARIABLE_SPLIT_RE.split(value):
+        name, _, var = item.partition('=')
+        variables[name] = var.replace('\\,', ',')
+    return variables
+
+def libpbs_jobs():
+    """Return (jobid, job) pairs from the PBS server via libpbs, None to use qstat"""
+    lib = _load_libpbs()
+    if lib is None:
+        return None
+    conn = lib.pbs_connect(lib.pbs_default())
+    if conn < 0:
+        return None
+    
+    try:
+        # Chain an attrl list so the server only sends the attributes we use
+        attribs = (_Attrl * len(_STAT_ATTRIBUTES))()
+        for i, name in enumerate(_STAT_ATTRIBUTES):
+            attribs[i].name = name
+            if i + 1 < len(_STAT_ATTRIBUTES):
+                attribs[i].next = ctypes.pointer(attribs[i + 1])
         
-if __name__ == "__main__":
-    json_data = get_qstat_json()
-    #print (json_data)
-    job_info = get_job_directory(json_data)
-    #if job_info:
-    #    for jobId, vals in job_info.items():
-    #        print (jobId + "\t" + job_info[jobId]["Job_Name"] + "\t" + job_info[jobId]["Job Path"] + "\t" + str(job_info[jobId]["CPUs"]) + "\t" + job_info[jobId]["Status"] + "\t" + job_info[jobId]["Owner"] + "\t" + job_info[jobId]["Memory"])
-    #else :
-    #    print ("No jobs running")
-    job_list = []
-    for jobid, job_info in job_info.items():
-        job_data = OrderedDict()
-        job_data['JobID'] = jobid
-        job_data['Job_Name'] = job_info['Job_Name']
-        job_data['Job_Path'] = job_info['Job Path']
-        job_data['CPUs'] = job_info['CPUs']
-        job_data['Status'] = job_info['Status']
-        job_data['Owner'] = job_info['Owner']
-        job_data['Memory'] = job_info['Memory']
-        job_list.append(job_data)
-    print(json.dumps(job_list))
+        status = lib.pbs_statjob(conn, None, attribs, None)
+        if not status:
+            # NULL also means an empty queue; only an error falls back to qstat
+            return [] if _pbs_errno(lib) == 0 else None
+        
+        try:
+            jobs = []
+            node = status
+            while node:
+                job = {'resources_used': {}, 'Variable_List': {}}
+                attr = node.contents.attribs
+                while attr:
+                    name = attr.contents.name.decode('utf-8', 'ignore')
+                    value = (attr.contents.value or b'').decode('utf-8', 'ignore')
+                    if name == 'resources_used':
+                        resource = attr.contents.resource.decode('utf-8', 'ignore')
+                        job['resources_used'][resource] = int(value) if value.isdigit() else value
+                    elif name == 'Variable_List':
+                        job['Variable_List'] = _parse_variable_list(value)
+                    else:
+                        job[name] = value
+                    attr = attr.contents.next
+                jobs.append((node.contents.name.decode('utf-8', 'ignore'), job))
+                node = node.contents.next
+            return jobs
+        finally:
+            lib.pbs_statfree(status)
+    finally:
+        lib.pbs_disconnect(conn)
+
+class _BufferReader:
+    """Read-only file over a bytes-like object; io.BytesIO would copy a bytearray whole"""
+    
+    def __init__(self, buf):
+        self._view = memoryview(buf)
+        self._pos = 0
+    
+    def read(self, size=-1):
+        start = self._pos
+        end = len(self._view) if size < 0 else min(start + size, len(self._view))
+        self._pos = end
+        return self._view[start:end].tobytes()
+
+def iter_qstat_jobs():
+    """Yield (jobid, job) pairs from libpbs if possible, otherwise from qstat"""
+    jobs = libpbs_jobs()
+    if jobs is not None:
+        yield from jobs
+        return
+    
+    if ijson is None:
+        yield from get_qstat_json().get("Jobs", {}).items()
+        return
     
-    
\ No newline at end of file
+    clean_qstat_output = cached_qstat_output()
+    count = 0
+    try:
+        for jobid, job in ijson.kvitems(_BufferReader(clean_qstat_output), 'Jobs', use_float=True):
+            count += 1
+            yield jobid, job
+    except (ijson.JSONError, UnicodeDecodeError):
+        # Retry with the tolerant full parse (e.g. invalid UTF-8), skipping
+        # the jobs that were already emitted
+        try:
+            results = _parse_qstat_json(clean_qstat_output)
+        except ValueError as err:
+            _report_parse_error(err, clean_qstat_output)
+        yield from itertools.islice(results.get("Jobs", {}).items(), count, None)
+    
+
+def _format_mem(mem):
+    """Format a PBS memory value such as '2097152kb' as Mb or Gb"""
+    if mem.endswith("kb") :
+        kb = int(mem[:-2])
+        if kb > 1048576 :
+            return f"{kb / 1048576:.1f}Gb"
+        return f"{kb / 1024:.1f}Mb"
+    return mem
+
+def build_job_list(jobs) :
+    """Build the --json output list from (jobid, job) pairs"""
+    job_list = []
+    for jobid, job in jobs:
+        # Queued jobs have no resources_used yet
+        ru = job.get('resources_used') or {}
+        vl = job['Variable_List']
+        job_list.append({
+            'JobID': jobid,
+            'Job_Name': job['Job_Name'],
+            'Job_Path': vl['PBS_O_WORKDIR'],
+            'CPUs': ru.get('ncpus', 0),
+            'Status': job['job_state'],
+            'Owner': job['Job_Owner'].partition('@')[0],
+            'Memory': _format_mem(ru.get('mem', '0kb'))
+        })
+    return job_list
+
+def get_job_list():
+    """Return the current jobs as a list in the --json output format"""
+    return build_job_list(iter_qstat_jobs())
+
+
+def write_job_list(job_list):
+    """Write job_list to stdout as a single line of JSON"""
+    if orjson is not None:
+        data = orjson.dumps(job_list)
+    else:
+        data = json.dumps(job_list).encode('utf-8')
+    sys.stdout.buffer.write(data + b'\n')
+    sys.stdout.buffer.flush()
+
+
+def serve():
+    """Answer LIST requests from stdin with one JSON line each until EOF"""
+    sys.stdout.buffer.write(b"READY\n")
+    sys.stdout.buffer.flush()
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            break
+        if line.strip() == "LIST":
+            write_job_list(get_job_list())
+        else:
+            sys.stderr.write("Unknown request: {0}\n".format(line.strip()))
+            write_job_list([])
+
+
+if __name__ == "__main__":
+    if "--server-mode" in sys.argv[1:]:
+        serve()
+    else:
+        write_job_list(get_job_list())